@@ -6,6 +6,16 @@ cd "$(dirname "$0")"
 # Add any new writeup files
 git add Daily_write_ups/*.txt
 
+# Add the collector run metrics the dashboard Ops page charts
+if [ -f metrics/runs.jsonl ]; then
+    git add metrics/runs.jsonl
+fi
+
+# Add the headline sentiment history the dashboard charts
+if [ -f headline_sentiment.jsonl ]; then
+    git add headline_sentiment.jsonl
+fi
+
 # Only commit if there are changes
 if git diff --cached --quiet; then
     echo "No new writeups to commit"
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sentiment_lexicon.json")
+BATCH_SIZE = 256
+
+# Keyword buckets shared with the dashboard's news filter
+NEWS_CATEGORIES = {
+    "Markets": ["stock", "market", "index", "S&P", "Dow", "Nasdaq"],
+    "Economy": ["GDP", "inflation", "economy", "Fed", "rates"],
+    "Companies": ["Inc", "Corp", "Company", "CEO"],
+    "Commodities": ["oil", "gold", "commodity", "crude"],
+    "Currencies": ["dollar", "currency", "forex", "USD"]
+}
+
+_TOKEN_PATTERN = r"[a-z]+"
+_FIELDS = [
+    "url_hash", "url", "title", "source", "published_date", "categories",
+    "positive", "negative", "tokens", "score", "scored_at",
+]
+
+
+# Scored headlines are kept so each URL is scored once and the dashboard can
+# chart sentiment over time. NewsAPI only serves recent articles, so the
+# history can't be rebuilt: it lives in an append-only JSONL file that is
+# committed with the data. The SQLite file is a local, rebuildable cache of
+# that history for hash lookups and aggregation. Paths are read on use so
+# they can be set in .env.
+def history_path():
+    return os.getenv("SENTIMENT_HISTORY_PATH", "headline_sentiment.jsonl")
+
+
+def cache_path():
+    return os.getenv("SENTIMENT_DB_PATH", "headline_sentiment.sqlite")
+
+
+def categorize_headline(headline):
+    categories = []
+    for category, words in NEWS_CATEGORIES.items():
+        if any(word.lower() in headline.lower() for word in words):
+            categories.append(category)
+    return categories if categories else ["Other"]
+
+
+def url_hash(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def load_lexicon(path=LEXICON_PATH):
+    """Return a Series mapping lowercase word -> +1 (positive) / -1 (negative).
+
+    If LM_DICTIONARY_PATH points at the Loughran-McDonald Master Dictionary
+    CSV, its Positive/Negative columns are used instead of the bundled list.
+    Those columns hold the year a word was added (negative if it was later
+    removed), so only positive values count.
+    """
+    lm_path = os.getenv("LM_DICTIONARY_PATH")
+    if lm_path:
+        lm = pd.read_csv(lm_path, usecols=["Word", "Positive", "Negative"])
+        words = lm["Word"].astype(str).str.lower()
+        polarity = (lm["Positive"] > 0).astype(int) - (lm["Negative"] > 0).astype(int)
+        lexicon = pd.Series(polarity.values, index=words)
+    else:
+        with open(path, "r") as f:
+            data = json.load(f)
+        lexicon = pd.concat([
+            pd.Series(1, index=data["positive"]),
+            pd.Series(-1, index=data["negative"]),
+        ])
+    lexicon = lexicon[lexicon != 0]
+    return lexicon[~lexicon.index.duplicated()]
+
+
+def score_headlines(headlines, lexicon):
+    """Score a batch of headlines in one pass.
+
+    Returns a DataFrame aligned with ``headlines`` with positive/negative word
+    counts, token count and a score in [-1, 1]: (pos - neg) / (pos + neg),
+    or 0 when no lexicon words appear.
+    """
+    titles = pd.Series(list(headlines), dtype="object").fillna("")
+    tokens = titles.str.lower().str.findall(_TOKEN_PATTERN)
+    polarity = tokens.explode().map(lexicon)
+
+    positive = polarity.gt(0).groupby(level=0).sum().reindex(titles.index, fill_value=0)
+    negative = polarity.lt(0).groupby(level=0).sum().reindex(titles.index, fill_value=0)
+    hits = positive + negative
+    score = ((positive - negative) / hits.where(hits > 0)).fillna(0.0)
+
+    return pd.DataFrame({
+        "positive": positive.astype(int),
+        "negative": negative.astype(int),
+        "tokens": tokens.str.len().astype(int),
+        "score": score.round(4),
+    })
+
+
+def connect(path=None, history=None):
+    """Open the local cache and load any history lines it hasn't seen yet."""
+    conn = sqlite3.connect(path or cache_path())
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS headline_sentiment (
+            url_hash TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            title TEXT NOT NULL,
+            source TEXT,
+            published_date TEXT NOT NULL,
+            categories TEXT NOT NULL,
+            positive INTEGER NOT NULL,
+            negative INTEGER NOT NULL,
+            tokens INTEGER NOT NULL,
+            score REAL NOT NULL,
+            scored_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS history_state (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            offset INTEGER NOT NULL
+        );
+    """)
+    sync_cache(conn, history)
+    return conn
+
+
+def sync_cache(conn, history=None):
+    """Load history lines appended since the last sync into the cache.
+
+    Only the bytes past the stored offset are read. If the history file
+    shrank (rewritten or replaced), the cache is rebuilt from scratch.
+    Returns the number of rows loaded.
+    """
+    history = history or history_path()
+    row = conn.execute("SELECT offset FROM history_state WHERE id = 0").fetchone()
+    offset = row[0] if row else 0
+    size = os.path.getsize(history) if os.path.exists(history) else 0
+    if size < offset:
+        logger.info("Sentiment history shrank; rebuilding cache")
+        with conn:
+            conn.execute("DELETE FROM headline_sentiment")
+        offset = 0
+    if size == offset:
+        return 0
+
+    with open(history, "rb") as f:
+        f.seek(offset)
+        chunk = f.read()
+    # A trailing partial line (e.g. from an interrupted write) is left for
+    # _append_lines to drop; corrupt complete lines are skipped, not fatal.
+    complete = chunk[:chunk.rfind(b"\n") + 1]
+    records = []
+    for lineno, line in enumerate(complete.decode("utf-8", errors="replace").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not all(field in record for field in _FIELDS):
+                raise ValueError("missing fields")
+        except ValueError as e:
+            logger.warning(f"Skipping unreadable line {lineno} after byte {offset} of {history}: {e}")
+            continue
+        records.append(record)
+    rows = [
+        tuple(",".join(r[f]) if f == "categories" else r[f] for f in _FIELDS)
+        for r in records
+    ]
+    with conn:
+        conn.executemany(
+            f"INSERT OR IGNORE INTO headline_sentiment VALUES ({', '.join('?' * len(_FIELDS))})", rows
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO history_state (id, offset) VALUES (0, ?)",
+            (offset + len(complete),),
+        )
+    return len(rows)
+
+
+def _append_lines(history, lines):
+    """Append JSON lines to the history in a single write.
+
+    If the file doesn't end with a newline, an earlier write was cut off;
+    that fragment is truncated away first so it can't be glued onto the
+    next record.
+    """
+    with open(history, "a+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                f.seek(0)
+                keep = f.read().rfind(b"\n") + 1
+                f.truncate(keep)
+                logger.warning(f"Dropped {size - keep} bytes of a partial line at the end of {history}")
+        f.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def _cached_hashes(conn, hashes):
+    cached = set()
+    hashes = list(hashes)
+    # Stay under SQLite's bound-parameter limit
+    for i in range(0, len(hashes), 500):
+        chunk = hashes[i:i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        cached.update(row[0] for row in conn.execute(
+            f"SELECT url_hash FROM headline_sentiment WHERE url_hash IN ({placeholders})", chunk
+        ))
+    return cached
+
+
+def score_articles(conn, articles, lexicon=None, batch_size=BATCH_SIZE, history=None):
+    """Score NewsAPI articles that haven't been scored before and store them.
+
+    Articles are deduplicated by URL hash; anything already in the history is
+    skipped. New scores are appended to the history file and then loaded into
+    the cache. Returns the number of newly scored headlines.
+    """
+    history = history or history_path()
+    new = {}
+    for article in articles:
+        url = article.get("url")
+        if not url or not article.get("title"):
+            continue
+        new.setdefault(url_hash(url), article)
+    for cached in _cached_hashes(conn, new):
+        del new[cached]
+    if not new:
+        return 0
+
+    if lexicon is None:
+        lexicon = load_lexicon()
+    scored_at = datetime.now(timezone.utc).isoformat()
+    items = list(new.items())
+    lines = []
+    for i in range(0, len(items), batch_size):
+        batch = items[i:i + batch_size]
+        titles = [article["title"] for _, article in batch]
+        scores = score_headlines(titles, lexicon)
+        lines.extend(
+            json.dumps({
+                "url_hash": key,
+                "url": article["url"],
+                "title": article["title"],
+                "source": (article.get("source") or {}).get("name"),
+                "published_date": (article.get("publishedAt") or scored_at)[:10],
+                "categories": categorize_headline(article["title"]),
+                "positive": int(s.positive),
+                "negative": int(s.negative),
+                "tokens": int(s.tokens),
+                "score": float(s.score),
+                "scored_at": scored_at,
+            })
+            for (key, article), s in zip(batch, scores.itertuples(index=False))
+        )
+    _append_lines(history, lines)
+    sync_cache(conn, history)
+    logger.info(f"Scored {len(items)} new headlines ({len(articles) - len(items)} cached or skipped)")
+    return len(items)
+
+
+def load_history(conn):
+    """All scored headlines, one row per (headline, category)."""
+    df = pd.read_sql_query(
+        "SELECT url_hash, published_date, categories, positive, negative, score FROM headline_sentiment",
+        conn,
+    )
+    df["category"] = df["categories"].str.split(",")
+    return df.drop(columns="categories").explode("category")
+
+
+def category_series(conn):
+    """Daily headline sentiment per category.
+
+    ``score`` averages only headlines with at least one lexicon hit, so
+    neutral-by-default headlines don't drag the mean to zero; ``headlines``
+    and ``scored`` give the total and hit counts behind each point.
+    """
+    history = load_history(conn)
+    if history.empty:
+        return pd.DataFrame(columns=["published_date", "category", "score", "headlines", "scored"])
+    history["hit_score"] = history["score"].where(history["positive"] + history["negative"] > 0)
+    return (
+        history.groupby(["published_date", "category"])
+        .agg(
+            score=("hit_score", "mean"),
+            headlines=("url_hash", "count"),
+            scored=("hit_score", "count"),
+        )
+        .reset_index()
+        .sort_values("published_date")
+    )
@@ -14,9 +14,152 @@ from fredapi import Fred
 from google import genai
 from dotenv import load_dotenv
 import unicodedata 
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from newsletter_metrics import RunMetrics, payload_size, profile_run
+import sqlite3
+import writeup_index
+import headline_sentiment
+
+logger = logging.getLogger(__name__)
+
 #test
-def main():
-    load_dotenv()
+EDITIONS_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "editions.json")
+
+# Used when editions.json is missing or unreadable so a run still produces
+# the original PM brief
+DEFAULT_CONFIG = {
+    "model": "gemini-2.5-flash",
+    "max_concurrency": 1,
+    "editions": [
+        {
+            "name": "pm",
+            "label": "PM Brief",
+            "file_tag": "",
+            "title": "PM Market Brief by Gemini",
+            "role": "an experienced economist and financial analyst specializing in market dynamics, bond markets, and Treasury yields",
+            "newsletter": "a daily PM financial newsletter that summarizes the key market developments of the day",
+            "goal": "Your goal is to highlight the most important news, notable market movements, and any meaningful economic signals.",
+            "sections": [
+                {"title": "Market Summary", "points": ["Major Indices Performance", "VIX and Market Sentiment"]},
+                {"title": "Fixed Income & Macro", "points": ["Treasury Spreads Analysis", "Dollar Index Movements"]},
+                {"title": "Commodities & Energy", "points": ["Oil Markets (WTI/Brent)", "Gold Price Action"]},
+                {"title": "Economic Data", "points": ["Today's Releases", "Forward Calendar"]},
+                {"title": "Key Takeaways & Outlook", "points": []}
+            ]
+        }
+    ]
+}
+
+
+def load_editions(path=EDITIONS_CONFIG):
+    """Load edition templates, keeping only those named in NEWSLETTER_EDITIONS if it is set."""
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+        if 'editions' not in config:
+            raise KeyError('editions')
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        logger.warning(f"Could not load {path} ({e}); generating the PM edition only")
+        config = json.loads(json.dumps(DEFAULT_CONFIG))
+    
+    selected = os.getenv("NEWSLETTER_EDITIONS")
+    if selected:
+        names = {name.strip() for name in selected.split(",") if name.strip()}
+        unknown = names - {edition['name'] for edition in config['editions']}
+        if unknown:
+            logger.warning(f"Unknown editions in NEWSLETTER_EDITIONS: {', '.join(sorted(unknown))}")
+        config['editions'] = [e for e in config['editions'] if e['name'] in names]
+    return config
+
+
+def writeup_filename(today, edition):
+    # The PM edition keeps the original name so existing readers of
+    # "*dailywriteup.txt" still pick it up; other editions get a suffix.
+    return f"{today}dailywriteup{edition.get('file_tag', '')}.txt"
+
+
+def build_prompt(edition, snapshot):
+    """Render one edition's prompt from the shared data snapshot."""
+    sections = ""
+    for i, section in enumerate(edition['sections'], start=1):
+        sections += f"{i}. {section['title']}\n"
+        for point in section.get('points', []):
+            sections += f"   - {point}\n"
+    
+    return (
+        f"You are {edition['role']}. Format your response in plain text only, avoiding any special formatting or markdown.\n\n"
+        f"You are the author of {edition['newsletter']}. "
+        f"The market brief should be titled '{edition['title']}' in plain text. Be sure to reformat all of the information taken from brent crude oil as it is an issue in your past editions "
+        f"{edition['goal']} "
+        f"If the date corresponds to a weekend, do not include market tickers or Magnificent 7 stock data.\n\n"
+        f"Your task is to analyze and interpret the following financial data:\n"
+        f"• The 10-Year minus 2-Year Treasury yield spread\n"
+        f"• Major stock indices (daily open and close)\n"
+        f"• Market Volatility (VIX)\n"
+        f"• Commodities (WTI Crude, Brent Crude, Gold)\n"
+        f"• Currency Markets (US Dollar Index)\n"
+        f"• The Magnificent 7 stock prices (daily open and close, last seven days)\n"
+        f"• Recent and scheduled economic releases\n"
+        f"• Key market news headlines from the last 24 hours\n\n"
+        f"Please organize your analysis into these sections: \n"
+        f"{sections}\n"
+        f"Also include a neatly formatted table summarizing key numerical data (excluding news headlines).\n\n"
+        f"Data for analysis (Date: {snapshot['today']}):\n"
+        f"Note on data currency:\n{snapshot['data_date_notes']}\n"
+        f"— Last 5 days of 10-Year minus 2-Year Treasury yield spread, the 30 yr five yr spread, the ten three month spread and the five year 2 yr spread: {snapshot['spreads']}\n"
+        f"— Market indices and indicators: {snapshot['indice_data_str']}\n"
+        f"— Magnificent 7 stock prices (last seven days, daily open and close): {snapshot['ticker_data']}\n"
+        f"— Economic releases from FRED: \n"
+        f"— Market news headlines (past 24h): {snapshot['newsstr']}\n"
+        f"create a nicely formatted table summarizing key numerical data (excluding news headlines). All of this information should be suitable for the syntax and style of the streamlit application\n\n"
+    )
+
+
+def generate_writeup(client, model, edition, snapshot, metrics):
+    """Make one LLM call for an edition; returns the normalized text or None on failure."""
+    prompt = build_prompt(edition, snapshot)
+    llm_start = time.perf_counter()
+    try:
+        response = client.models.generate_content(
+            model=model,
+            contents=prompt
+        )
+    except Exception as e:
+        metrics.record_llm(edition['name'], model, time.perf_counter() - llm_start, error=f"{type(e).__name__}: {e}")
+        logger.error(f"Error generating {edition['name']} writeup: {e}")
+        return None
+    metrics.record_llm(edition['name'], model, time.perf_counter() - llm_start, response)
+    return unicodedata.normalize("NFKD", str(response.text))
+
+
+def generate_editions(config, snapshot, metrics):
+    """Generate all configured editions concurrently, at most max_concurrency at a time.
+
+    Returns (edition, text) pairs, in config order, for the editions that succeeded.
+    """
+    editions = config['editions']
+    if not editions:
+        return []
+    model = config.get('model', "gemini-2.5-flash")
+    max_concurrency = config.get('max_concurrency', len(editions))
+    override = os.getenv("LLM_MAX_CONCURRENCY")
+    if override:
+        try:
+            max_concurrency = int(override)
+        except ValueError:
+            logger.warning(f"Ignoring invalid LLM_MAX_CONCURRENCY={override!r}; using {max_concurrency}")
+    
+    client = genai.Client(api_key=os.getenv("GOOGLE_KEY"))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(editions)))) as pool:
+        futures = [pool.submit(generate_writeup, client, model, edition, snapshot, metrics)
+                   for edition in editions]
+        texts = [future.result() for future in futures]
+    return [(edition, text) for edition, text in zip(editions, texts) if text is not None]
+
+
+def collect(metrics):
     # Initialize Chrome options for headless operation
     options = Options()
     options.add_argument("--headless") 
@@ -52,13 +195,16 @@ def main():
     spread_series = {}
     for tenor, series_id in yield_curves.items():
         try:
-            series = fred.get_series(series_id, observation_start=start_date, observation_end=today)
+            with metrics.source_call('fred', series_id) as call:
+                series = fred.get_series(series_id, observation_start=start_date, observation_end=today)
+                call['rows'] = len(series)
+                call['bytes'] = payload_size(series)
             # Convert timestamps to string format
             yield_data[tenor] = {date.strftime('%Y-%m-%d'): value 
                                for date, value in series.to_dict().items()}
             spread_series[tenor] = series
         except Exception as e:
-            print(f"Error fetching {series_id}: {e}")
+            logger.error(f"Error fetching {series_id}: {e}")
     
     # Calculate important spreads
     spreads = {}
@@ -68,7 +214,7 @@ def main():
         '30Y-5Y': (spread_series['30Y'] - spread_series['5Y']),  # Long-term growth expectations
         '5Y-2Y': (spread_series['5Y'] - spread_series['2Y'])  # Medium-term expectations
     }
-    print(spread_calcs)
+    logger.debug("Spread calcs: %s", spread_calcs)
 
     for name, series in spread_calcs.items():
         spreads[name] = {date.strftime('%Y-%m-%d'): value 
@@ -114,18 +260,24 @@ def main():
     latest_economic_data = {}
     for indicator_name, series_id in economic_indicators.items():
         try:
-            series = fred.get_series(series_id, observation_start=start_date, observation_end=today)
+            with metrics.source_call('fred', series_id) as call:
+                series = fred.get_series(series_id, observation_start=start_date, observation_end=today)
+                call['rows'] = len(series)
+                call['bytes'] = payload_size(series)
             if not series.empty:
                 latest_date = series.index[-1]
                 latest_value = series.iloc[-1]
                 latest_economic_data[indicator_name] = f"{latest_date.strftime('%Y-%m-%d')}: {latest_value:.2f}"
         except Exception as e:
-            print(f"Error fetching {series_id}: {e}")
+            logger.error(f"Error fetching {series_id}: {e}")
     
 
     # Get stock data
     tickers = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA"]
-    data = yf.download(tickers, start=start_date, end=today + timedelta(days=1), interval="1d", group_by='ticker')
+    with metrics.source_call('yfinance', 'mag7') as call:
+        data = yf.download(tickers, start=start_date, end=today + timedelta(days=1), interval="1d", group_by='ticker')
+        call['rows'] = len(data)
+        call['bytes'] = payload_size(data)
     ticker_data = ""
     latest_ticker_date = None
     for ticker in tickers:
@@ -150,7 +302,10 @@ def main():
         "DX-Y.NYB"
     ]
     
-    data = yf.download(indices, start=today, end=today + timedelta(days=1), interval="1d", group_by='ticker')
+    with metrics.source_call('yfinance', 'indices') as call:
+        data = yf.download(indices, start=today, end=today + timedelta(days=1), interval="1d", group_by='ticker')
+        call['rows'] = len(data)
+        call['bytes'] = payload_size(data)
     
     symbol_names = {
         "^GSPC": "S&P 500",
@@ -173,7 +328,7 @@ def main():
             indice_data = f"{name}: Open: {open_price:.2f} Close: {close_price:.2f}"
             indice_data_str += indice_data + '. '
         except (KeyError, IndexError) as e:
-            print(f"Error getting data for {index}: {e}")
+            logger.warning(f"Error getting data for {index}: {e}")
     
     # Get news
     API_KEY = os.getenv("NewsApikey")
@@ -202,21 +357,32 @@ def main():
     newsstr = f"\n📰 Broad Market News for {today}:\n"
     
     for query in queries:
-        print(f"Fetching news for query: {query}")
+        logger.info(f"Fetching news for query: {query}")
         params = base_params.copy()
         params["q"] = query
         
-        response = requests.get(url, params=params)
-        if response.status_code != 200:
-            print(f"Error {response.status_code} for query '{query}':", response.json().get("message"))
-            continue
-            
-        data = response.json()
-        if data.get("status") == "ok":
-            articles = data.get("articles", [])
-            all_articles.extend(articles)
-        else:
-            print(f"Failed to fetch articles for query '{query}':", data.get("message"))
+        with metrics.source_call('newsapi', query) as call:
+            response = requests.get(url, params=params)
+            call['bytes'] = payload_size(response)
+            if response.status_code != 200:
+                call['error'] = f"HTTP {response.status_code}: {response.json().get('message')}"
+                continue
+                
+            data = response.json()
+            if data.get("status") == "ok":
+                articles = data.get("articles", [])
+                call['rows'] = len(articles)
+                all_articles.extend(articles)
+            else:
+                call['error'] = f"Failed to fetch articles: {data.get('message')}"
+    
+    # Score headline tone locally; URLs scored on earlier runs are skipped
+    try:
+        sentiment_conn = headline_sentiment.connect()
+        headline_sentiment.score_articles(sentiment_conn, all_articles)
+        sentiment_conn.close()
+    except (sqlite3.Error, OSError, ValueError) as e:
+        logger.warning(f"Could not score headline sentiment: {e}")
     
     for i, article in enumerate(all_articles):
         title = article['title']
@@ -240,7 +406,7 @@ def main():
     with open('market_data.json', 'w') as f:
         json.dump(market_data, f)
     
-    # Generate daily writeup
+    # Generate every edition's writeup from this one in-memory snapshot
     # Make explicit which dates the provided data covers so the model doesn't
     # accidentally assume 'today' for data that is only available up to an
     # earlier date (FRED and some series publish with a lag).
@@ -248,65 +414,36 @@ def main():
         f"Latest available spread data date: {latest_spread_date}.\n"
         f"Latest available ticker data date: {latest_ticker_date or 'N/A'}.\n"
     )
-
-    message = (
-        f"You are an experienced economist and financial analyst specializing in market dynamics, bond markets, and Treasury yields. Format your response in plain text only, avoiding any special formatting or markdown.\n\n"
-        f"You are the author of a daily PM financial newsletter that summarizes the key market developments of the day. "
-        f"The market brief should be titled 'PM Market Brief by Gemini' in plain text. Be sure to reformat all of the information taken from brent crude oil as it is an issue in your past editions "
-        f"Your goal is to highlight the most important news, notable market movements, and any meaningful economic signals. "
-        f"If the date corresponds to a weekend, do not include market tickers or Magnificent 7 stock data.\n\n"
-        f"Your task is to analyze and interpret the following financial data:\n"
-        f"• The 10-Year minus 2-Year Treasury yield spread\n"
-        f"• Major stock indices (daily open and close)\n"
-        f"• Market Volatility (VIX)\n"
-        f"• Commodities (WTI Crude, Brent Crude, Gold)\n"
-        f"• Currency Markets (US Dollar Index)\n"
-        f"• The Magnificent 7 stock prices (daily open and close, last seven days)\n"
-        f"• Recent and scheduled economic releases\n"
-        f"• Key market news headlines from the last 24 hours\n\n"
-        f"Please organize your analysis into these sections: \n"
-        f"1. Market Summary\n"
-        f"   - Major Indices Performance\n"
-        f"   - VIX and Market Sentiment\n"
-        f"2. Fixed Income & Macro\n"
-        f"   - Treasury Spreads Analysis\n"
-        f"   - Dollar Index Movements\n"
-        f"3. Commodities & Energy\n"
-        f"   - Oil Markets (WTI/Brent)\n"
-        f"   - Gold Price Action\n"
-        f"4. Economic Data\n"
-        f"   - Today's Releases\n"
-        f"   - Forward Calendar\n"
-        f"5. Key Takeaways & Outlook\n\n"
-        f"Also include a neatly formatted table summarizing key numerical data (excluding news headlines).\n\n"
-    f"Data for analysis (Date: {today}):\n"
-    f"Note on data currency:\n{data_date_notes}\n"
-    f"— Last 5 days of 10-Year minus 2-Year Treasury yield spread, the 30 yr five yr spread, the ten three month spread and the five year 2 yr spread: {tenyrtwoyr,thirtyfivey, tenthreem, fiveytwoyr}\n"
-        f"— Market indices and indicators: {indice_data_str}\n"
-        f"— Magnificent 7 stock prices (last seven days, daily open and close): {ticker_data}\n"
-        f"— Economic releases from FRED: \n"
-        f"— Market news headlines (past 24h): {newsstr}\n"
-        f"create a nicely formatted table summarizing key numerical data (excluding news headlines). All of this information should be suitable for the syntax and style of the streamlit application\n\n"
-
-    )
+    snapshot = {
+        'today': today,
+        'data_date_notes': data_date_notes,
+        'spreads': (tenyrtwoyr, thirtyfivey, tenthreem, fiveytwoyr),
+        'indice_data_str': indice_data_str,
+        'ticker_data': ticker_data,
+        'newsstr': newsstr
+    }
     
-    client = genai.Client(api_key=os.getenv("GOOGLE_KEY"))
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=message
-    ) 
-    response = str(response.text)
-    response = unicodedata.normalize("NFKD", response)
+    config = load_editions()
+    writeups = generate_editions(config, snapshot, metrics)
     
     folder = "Daily_write_ups"
     if not os.path.exists(folder):
         os.makedirs(folder)
         
-    filename = f"{today}dailywriteup.txt"
-    filepath = os.path.join(folder, filename)
+    for edition, text in writeups:
+        filepath = os.path.join(folder, writeup_filename(today, edition))
+        with open(filepath, "w") as f:
+            f.write(text)
+        logger.info(f"Wrote {edition['name']} writeup to {filepath}")
     
-    with open(filepath, "w") as f:
-        f.write(response)
+    # Add the new writeups to the search index. Unchanged files are skipped,
+    # so this only does work for what was just written (or missed earlier).
+    try:
+        index_conn = writeup_index.connect()
+        writeup_index.sync(index_conn, folder)
+        index_conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not update writeup search index: {e}")
     
     # Auto-commit the new writeup if we're not on Streamlit Cloud
     if os.getenv('IS_STREAMLIT_CLOUD') != 'true':
@@ -316,7 +453,29 @@ def main():
             if os.path.exists(commit_script):
                 os.system(f"bash {commit_script}")
         except Exception as e:
-            print(f"Warning: Could not auto-commit writeup: {e}")
+            logger.warning(f"Could not auto-commit writeup: {e}")
+
+
+def main():
+    load_dotenv()
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    
+    # Set NEWSLETTER_PROFILE=cprofile (or pyinstrument) to capture a run profile
+    metrics = RunMetrics()
+    try:
+        with profile_run(os.getenv("NEWSLETTER_PROFILE"), metrics.run_id):
+            collect(metrics)
+    finally:
+        metrics.finish()
+        try:
+            metrics.write_jsonl()
+            metrics.write_prometheus()
+        except OSError as e:
+            logger.warning(f"Could not write run metrics: {e}")
+        logger.info(f"Run {metrics.run_id} finished in {metrics.duration_s:.1f}s")
 
 if __name__ == "__main__":
      main()
\ No newline at end of file
@@ -4,6 +4,10 @@ import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
 import plotly.express as px
+import os
+import re
+import sqlite3
+import headline_sentiment
 
 # Theme configurations
 THEMES = {
@@ -45,10 +49,29 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+def load_editions():
+    """Load the edition list from editions.json, falling back to the PM brief only."""
+    try:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        with open(os.path.join(base_dir, 'editions.json'), 'r') as f:
+            return json.load(f)['editions']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return [{"name": "pm", "label": "PM Brief", "file_tag": ""}]
+
+EDITIONS = load_editions()
+
 # Sidebar for customization
 with st.sidebar:
     st.title("💠 Dashboard Settings")
     
+    # Edition selection
+    selected_edition = st.selectbox(
+        "Edition",
+        options=EDITIONS,
+        index=0,
+        format_func=lambda edition: edition.get('label', edition['name'])
+    )
+    
     # Theme selection
     selected_theme = st.selectbox(
         "Select Theme",
@@ -177,8 +200,8 @@ def load_market_data():
     except FileNotFoundError:
         return None
 
-def load_daily_writeup():
-    """Load the most recent daily writeup with fallback mechanisms for different hosting environments."""
+def load_daily_writeup(edition):
+    """Load the most recent daily writeup for an edition with fallback mechanisms for different hosting environments."""
     import os
     import glob
     from datetime import datetime
@@ -192,7 +215,13 @@ def load_daily_writeup():
         # First try the Git-tracked Daily_write_ups directory
         base_dir = os.path.dirname(os.path.abspath(__file__))
         writeup_dir = os.path.join(base_dir, "Daily_write_ups")
-        writeup_files = glob.glob(os.path.join(writeup_dir, "*dailywriteup.txt"))
+        # Match on the exact name so the PM brief doesn't pick up suffixed editions
+        tag = re.escape(edition.get('file_tag', ''))
+        pattern = re.compile(rf"^\d{{4}}-\d{{2}}-\d{{2}}dailywriteup{tag}\.txt$")
+        writeup_files = [
+            path for path in glob.glob(os.path.join(writeup_dir, "*dailywriteup*.txt"))
+            if pattern.match(os.path.basename(path))
+        ]
         
         if writeup_files:
             # Sort by filename to get latest (YYYY-MM-DD format ensures chronological order)
@@ -201,7 +230,7 @@ def load_daily_writeup():
                 content = f.read()
                 
             # Store filename for display
-            latest_date = os.path.basename(latest_file).replace('dailywriteup.txt', '')
+            latest_date = os.path.basename(latest_file)[:10]
             st.sidebar.info(f"Showing writeup from: {latest_date}")
             
             return content
@@ -210,14 +239,14 @@ def load_daily_writeup():
         st.sidebar.error(f"Error reading writeup: {str(e)}")
         return "Error loading the daily writeup. Please check logs for details."
     
-    return "No daily writeups available."
+    return f"No {edition.get('label', edition['name'])} writeups available."
 
 market_data = load_market_data()
 if not market_data:
     st.error("Market data file not found. Please run the data collection script first.")
     st.stop()
 
-daily_writeup = load_daily_writeup()
+daily_writeup = load_daily_writeup(selected_edition)
 
 # Main content container
 with st.container():
@@ -374,22 +403,6 @@ with st.container():
     st.markdown('<p class="section-header">📰 News Highlights</p>', unsafe_allow_html=True)
     news_data = market_data['newsstr'].split('\n')[2:]  # Skip header
     
-    # Simple news categorization (you can enhance this based on your needs)
-    def categorize_news(headline):
-        categories = []
-        keywords = {
-            "Markets": ["stock", "market", "index", "S&P", "Dow", "Nasdaq"],
-            "Economy": ["GDP", "inflation", "economy", "Fed", "rates"],
-            "Companies": ["Inc", "Corp", "Company", "CEO"],
-            "Commodities": ["oil", "gold", "commodity", "crude"],
-            "Currencies": ["dollar", "currency", "forex", "USD"]
-        }
-        
-        for category, words in keywords.items():
-            if any(word.lower() in headline.lower() for word in words):
-                categories.append(category)
-        return categories if categories else ["Other"]
-
     # Filter and display news
     filtered_news = []
     for news_item in news_data:
@@ -400,7 +413,7 @@ with st.container():
             source = parts[1].split("URL:")[0].strip() if len(parts) > 1 else "Unknown"
             
             # Categorize news
-            categories = categorize_news(headline)
+            categories = headline_sentiment.categorize_headline(headline)
             
             # Check if news matches selected categories
             if any(cat in news_categories for cat in categories):
@@ -419,3 +432,50 @@ with st.container():
         </div>
         """
         st.markdown(news_html, unsafe_allow_html=True)
+
+    # Headline sentiment over time, scored at collection time
+    st.markdown('<p class="section-header">🧭 Headline Sentiment</p>', unsafe_allow_html=True)
+    sentiment_df = None
+    try:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        history_path = os.path.join(base_dir, headline_sentiment.history_path())
+        cache_path = os.path.join(base_dir, headline_sentiment.cache_path())
+        if os.path.exists(history_path):
+            # The local cache only reads history lines appended since its last sync
+            sentiment_conn = headline_sentiment.connect(cache_path, history_path)
+            sentiment_df = headline_sentiment.category_series(sentiment_conn)
+            sentiment_conn.close()
+    except (sqlite3.Error, OSError, ValueError) as e:
+        st.warning(f"Could not load headline sentiment: {e}")
+    
+    if sentiment_df is None or sentiment_df.empty:
+        st.info("No headline sentiment recorded yet. It is scored each time the collector runs.")
+    else:
+        sentiment_df = sentiment_df[sentiment_df['category'].isin(news_categories + ["Other"])]
+        # Days where no headline in a category hit the lexicon have no score
+        sentiment_df = sentiment_df.dropna(subset=['score'])
+        fig_sentiment = px.line(
+            sentiment_df,
+            x='published_date',
+            y='score',
+            color='category',
+            markers=True,
+            hover_data=['scored', 'headlines']
+        )
+        fig_sentiment.add_hline(y=0, line_color=theme['accent'], line_dash='dash')
+        fig_sentiment.update_layout(
+            title={
+                'text': 'Average Headline Sentiment by Category (headlines with lexicon hits)',
+                'x': 0.5,
+                'xanchor': 'center'
+            },
+            xaxis_title='Date',
+            yaxis_title='Sentiment (-1 to 1)',
+            yaxis_range=[-1, 1],
+            template='plotly_white',
+            height=350,
+            margin=dict(l=40, r=40, t=40, b=40),
+            plot_bgcolor='rgba(0,0,0,0.02)' if selected_theme != "Dark Mode" else 'rgba(255,255,255,0.02)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig_sentiment, use_container_width=True, key='headline_sentiment')
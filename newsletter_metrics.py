@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+# Where per-run telemetry lands. runs.jsonl is read by the dashboard Ops page;
+# the .prom file is meant for node_exporter's textfile collector. Paths are
+# resolved on use so METRICS_DIR/PROMETHEUS_TEXTFILE can come from .env.
+def metrics_dir():
+    return os.getenv("METRICS_DIR", "metrics")
+
+
+def runs_log_path():
+    return os.path.join(metrics_dir(), "runs.jsonl")
+
+
+def prometheus_textfile_path():
+    return os.getenv("PROMETHEUS_TEXTFILE", os.path.join(metrics_dir(), "newsletter_collector.prom"))
+
+
+def profile_dir():
+    return os.path.join(metrics_dir(), "profiles")
+
+
+def payload_size(obj):
+    """Best-effort size in bytes of a fetched payload (HTTP response or pandas object)."""
+    if obj is None:
+        return 0
+    if hasattr(obj, "content"):
+        return len(obj.content or b"")
+    if hasattr(obj, "memory_usage"):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    return len(str(obj).encode("utf-8"))
+
+
+class RunMetrics:
+    """Collects timings, sizes and errors for a single collector run."""
+
+    def __init__(self):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.duration_s = None
+        self.source_calls = []
+        self.llm_calls = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def source_call(self, source, name):
+        """Time one call to an external data source.
+
+        The yielded dict can be filled in with ``rows``, ``bytes`` and ``error``
+        by the caller; exceptions raised inside the block are recorded and
+        re-raised so existing error handling keeps working.
+        """
+        call = {"source": source, "name": name, "rows": 0, "bytes": 0, "error": None}
+        start = time.perf_counter()
+        try:
+            yield call
+        except Exception as e:
+            call["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            call["duration_s"] = round(time.perf_counter() - start, 4)
+            with self._lock:
+                self.source_calls.append(call)
+            if call["error"]:
+                logger.warning("%s %s failed after %.2fs: %s",
+                               source, name, call["duration_s"], call["error"])
+            else:
+                logger.info("%s %s: %d rows, %d bytes in %.2fs",
+                            source, name, call["rows"], call["bytes"], call["duration_s"])
+
+    def record_llm(self, name, model, latency_s, response=None, error=None):
+        """Record one LLM call, pulling token counts from the response usage metadata."""
+        usage = getattr(response, "usage_metadata", None)
+        call = {
+            "name": name,
+            "model": model,
+            "latency_s": round(latency_s, 4),
+            "prompt_tokens": getattr(usage, "prompt_token_count", None) or 0,
+            "output_tokens": getattr(usage, "candidates_token_count", None) or 0,
+            "total_tokens": getattr(usage, "total_token_count", None) or 0,
+            "error": error,
+        }
+        with self._lock:
+            self.llm_calls.append(call)
+        logger.info("LLM %s (%s): %.2fs, %d prompt / %d output tokens",
+                    name, model, call["latency_s"], call["prompt_tokens"], call["output_tokens"])
+
+    def finish(self):
+        self.duration_s = round(time.perf_counter() - self._start, 4)
+
+    def source_totals(self):
+        """Aggregate source calls by source name."""
+        totals = {}
+        for call in self.source_calls:
+            t = totals.setdefault(call["source"], {
+                "calls": 0, "errors": 0, "rows": 0, "bytes": 0, "duration_s": 0.0,
+            })
+            t["calls"] += 1
+            t["errors"] += 1 if call["error"] else 0
+            t["rows"] += call["rows"]
+            t["bytes"] += call["bytes"]
+            t["duration_s"] = round(t["duration_s"] + call["duration_s"], 4)
+        return totals
+
+    def to_record(self):
+        errors = sum(1 for c in self.source_calls if c["error"])
+        errors += sum(1 for c in self.llm_calls if c["error"])
+        calls = len(self.source_calls) + len(self.llm_calls)
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_s": self.duration_s,
+            "calls": calls,
+            "errors": errors,
+            "error_rate": round(errors / calls, 4) if calls else 0.0,
+            "sources": self.source_totals(),
+            "source_calls": self.source_calls,
+            "llm_calls": self.llm_calls,
+        }
+
+    def write_jsonl(self, path=None):
+        path = path or runs_log_path()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(self.to_record()) + "\n")
+
+    def write_prometheus(self, path=None):
+        """Write a Prometheus textfile-collector snapshot of this run.
+
+        The file is written to a temp name and renamed so node_exporter never
+        scrapes a half-written file.
+        """
+        path = path or prometheus_textfile_path()
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+
+        record = self.to_record()
+        totals = record["sources"]
+        metric("newsletter_run_duration_seconds", "Wall time of the last collector run.",
+               [({}, record["duration_s"] or 0)])
+        metric("newsletter_run_errors", "Failed source and LLM calls in the last run.",
+               [({}, record["errors"])])
+        metric("newsletter_run_timestamp_seconds", "Start time of the last collector run.",
+               [({}, int(self.started_at.timestamp()))])
+        metric("newsletter_source_duration_seconds", "Time spent calling each data source.",
+               [({"source": s}, t["duration_s"]) for s, t in totals.items()])
+        metric("newsletter_source_calls", "Calls made to each data source.",
+               [({"source": s}, t["calls"]) for s, t in totals.items()])
+        metric("newsletter_source_errors", "Failed calls to each data source.",
+               [({"source": s}, t["errors"]) for s, t in totals.items()])
+        metric("newsletter_source_rows", "Rows returned by each data source.",
+               [({"source": s}, t["rows"]) for s, t in totals.items()])
+        metric("newsletter_source_bytes", "Payload bytes returned by each data source.",
+               [({"source": s}, t["bytes"]) for s, t in totals.items()])
+        metric("newsletter_llm_latency_seconds", "Latency of each LLM call.",
+               [({"name": c["name"], "model": c["model"]}, c["latency_s"]) for c in self.llm_calls])
+        metric("newsletter_llm_prompt_tokens", "Prompt tokens sent per LLM call.",
+               [({"name": c["name"], "model": c["model"]}, c["prompt_tokens"]) for c in self.llm_calls])
+        metric("newsletter_llm_output_tokens", "Output tokens returned per LLM call.",
+               [({"name": c["name"], "model": c["model"]}, c["output_tokens"]) for c in self.llm_calls])
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+
+@contextmanager
+def profile_run(mode, run_id, output_dir=None):
+    """Optionally profile the enclosed block.
+
+    ``mode`` is ``"cprofile"`` or ``"pyinstrument"`` (usually taken from the
+    NEWSLETTER_PROFILE env var); anything else runs without a profiler.
+    """
+    mode = (mode or "").strip().lower()
+    if mode not in ("cprofile", "pyinstrument"):
+        yield
+        return
+
+    output_dir = output_dir or profile_dir()
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y-%m-%dT%H%M%S")
+
+    if mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("pyinstrument is not installed; falling back to cProfile")
+            mode = "cprofile"
+        else:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                path = os.path.join(output_dir, f"{stamp}_{run_id}.html")
+                with open(path, "w") as f:
+                    f.write(profiler.output_html())
+                logger.info("Wrote pyinstrument profile to %s", path)
+            return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path = os.path.join(output_dir, f"{stamp}_{run_id}.prof")
+        profiler.dump_stats(path)
+        logger.info("Wrote cProfile stats to %s (view with `python -m pstats` or snakeviz)", path)
@@ -0,0 +1,105 @@
+import streamlit as st
+import json
+import os
+import pandas as pd
+import plotly.graph_objects as go
+
+st.set_page_config(
+    page_title="Collector Ops",
+    page_icon="🛠️",
+    layout="wide"
+)
+
+def load_runs():
+    """Load per-run collector metrics written by newsletter_metrics.RunMetrics."""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs_path = os.path.join(base_dir, os.getenv("METRICS_DIR", "metrics"), "runs.jsonl")
+    runs = []
+    try:
+        with open(runs_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    runs.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A crashed run can leave a truncated last line; skip it
+                    continue
+    except FileNotFoundError:
+        return []
+    return runs
+
+st.title("🛠️ Collector Ops")
+
+runs = load_runs()
+if not runs:
+    st.info("No run metrics yet. They are written to metrics/runs.jsonl each time the collector runs.")
+    st.stop()
+
+runs_df = pd.DataFrame([
+    {
+        'started_at': pd.to_datetime(run['started_at']),
+        'run_id': run['run_id'],
+        'duration_s': run.get('duration_s'),
+        'calls': run.get('calls', 0),
+        'errors': run.get('errors', 0),
+        'error_rate': run.get('error_rate', 0.0) * 100,
+        # Editions are generated concurrently, so the slowest call is the LLM wall time
+        'llm_latency_s': max((c.get('latency_s', 0) for c in run.get('llm_calls', [])), default=0),
+        'llm_avg_latency_s': (
+            sum(c.get('latency_s', 0) for c in run.get('llm_calls', [])) / len(run['llm_calls'])
+            if run.get('llm_calls') else 0
+        ),
+        'llm_tokens': sum(c.get('total_tokens', 0) for c in run.get('llm_calls', [])),
+    }
+    for run in runs
+]).sort_values('started_at')
+
+# "Latest" is the most recent start time, not the last line in the file
+latest = runs_df.iloc[-1]
+latest_run = next(run for run in runs if run['run_id'] == latest['run_id'])
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Last run duration", f"{latest['duration_s'] or 0:.1f}s")
+col2.metric("Last run errors", f"{int(latest['errors'])} / {int(latest['calls'])}")
+col3.metric("Slowest LLM call", f"{latest['llm_latency_s']:.1f}s",
+            help=f"Average per call: {latest['llm_avg_latency_s']:.1f}s")
+col4.metric("LLM tokens", f"{int(latest['llm_tokens']):,}")
+
+def time_series_chart(y, title, yaxis_title, key):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=runs_df['started_at'],
+        y=runs_df[y],
+        mode='lines+markers',
+        name=title
+    ))
+    fig.update_layout(
+        title={'text': title, 'x': 0.5, 'xanchor': 'center'},
+        xaxis_title='Run started',
+        yaxis_title=yaxis_title,
+        template='plotly_white',
+        height=300,
+        margin=dict(l=40, r=40, t=40, b=40),
+        showlegend=False
+    )
+    st.plotly_chart(fig, use_container_width=True, key=key)
+
+left, right = st.columns(2)
+with left:
+    time_series_chart('duration_s', 'Run Duration', 'Seconds', 'ops_duration')
+with right:
+    time_series_chart('error_rate', 'Error Rate', 'Failed calls (%)', 'ops_error_rate')
+
+# Where the time went in the most recent run
+st.subheader("Latest run by source")
+sources = latest_run.get('sources', {})
+if sources:
+    sources_df = pd.DataFrame.from_dict(sources, orient='index')
+    sources_df.index.name = 'source'
+    st.dataframe(sources_df, use_container_width=True)
+
+failed = [c for c in latest_run.get('source_calls', []) + latest_run.get('llm_calls', []) if c.get('error')]
+if failed:
+    st.subheader("Errors in latest run")
+    st.dataframe(pd.DataFrame(failed), use_container_width=True)
@@ -0,0 +1,89 @@
+import streamlit as st
+import html
+import json
+import os
+import sys
+import time
+
+# Let the page import modules from the repo root
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+import writeup_index
+
+st.set_page_config(
+    page_title="Search Writeups",
+    page_icon="🔎",
+    layout="wide"
+)
+
+def load_edition_labels():
+    try:
+        with open(os.path.join(BASE_DIR, 'editions.json'), 'r') as f:
+            return {e['name']: e.get('label', e['name']) for e in json.load(f)['editions']}
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return {"pm": "PM Brief"}
+
+INDEX_PATH = writeup_index.index_path()
+if not os.path.isabs(INDEX_PATH):
+    INDEX_PATH = os.path.join(BASE_DIR, INDEX_PATH)
+WRITEUP_DIR = os.path.join(BASE_DIR, writeup_index.WRITEUP_DIR)
+
+@st.cache_resource(max_entries=1, show_spinner="Indexing writeups...")
+def sync_index(folder_mtime_ns):
+    """Bring the index up to date. Cached per process and keyed on the folder's
+    mtime, so the archive is only re-scanned when a writeup is added or removed."""
+    conn = writeup_index.connect(INDEX_PATH)
+    try:
+        writeup_index.sync(conn, WRITEUP_DIR)
+    finally:
+        conn.close()
+    return folder_mtime_ns
+
+def open_index():
+    sync_index(os.stat(WRITEUP_DIR).st_mtime_ns)
+    return writeup_index.connect(INDEX_PATH)
+
+def render_snippet(snippet):
+    # Escape "$" too, or Streamlit renders prices like "$64 ... $70" as LaTeX
+    text = html.escape(snippet).replace("$", "&#36;")
+    return (text.replace(writeup_index.HIGHLIGHT_START, "<mark>")
+                .replace(writeup_index.HIGHLIGHT_END, "</mark>"))
+
+st.title("🔎 Search Past Writeups")
+
+edition_labels = load_edition_labels()
+col1, col2, col3 = st.columns([4, 2, 1])
+with col1:
+    query = st.text_input(
+        "Search",
+        placeholder='e.g. inversion, Brent, "yield curve", NEAR(brent opec, 10)'
+    )
+with col2:
+    edition = st.selectbox(
+        "Edition",
+        options=[None] + list(edition_labels),
+        format_func=lambda name: "All editions" if name is None else edition_labels[name]
+    )
+with col3:
+    limit = st.number_input("Max results", min_value=5, max_value=200, value=20, step=5)
+
+if query.strip():
+    conn = open_index()
+    try:
+        start = time.perf_counter()
+        hits = writeup_index.search(conn, query, limit=int(limit), edition=edition)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        conn.close()
+
+    st.caption(f"{len(hits)} result(s) in {elapsed_ms:.1f} ms")
+    for hit in hits:
+        label = edition_labels.get(hit['edition'], hit['edition'])
+        with st.expander(f"{hit['date']} — {label}", expanded=True):
+            st.markdown(render_snippet(hit['snippet']), unsafe_allow_html=True)
+            writeup_path = os.path.join(BASE_DIR, writeup_index.WRITEUP_DIR, hit['path'])
+            if st.checkbox("Show full writeup", key=f"full_{hit['path']}"):
+                with open(writeup_path, 'r') as f:
+                    st.text(f.read())
@@ -0,0 +1,131 @@
+import json
+
+import pandas as pd
+import pytest
+
+import headline_sentiment
+
+
+@pytest.fixture
+def lexicon(monkeypatch):
+    monkeypatch.delenv("LM_DICTIONARY_PATH", raising=False)
+    return headline_sentiment.load_lexicon()
+
+
+@pytest.fixture
+def store(tmp_path):
+    history = str(tmp_path / "history.jsonl")
+    cache = str(tmp_path / "cache.sqlite")
+    conn = headline_sentiment.connect(cache, history)
+    yield conn, history, cache
+    conn.close()
+
+
+def article(url, title, published="2025-12-10T16:00:00Z"):
+    return {"url": url, "title": title, "source": {"name": "Wire"}, "publishedAt": published}
+
+
+def test_bundled_lexicon_includes_inflections(lexicon):
+    for word in ["fear", "fears", "fall", "falls", "fell", "sank", "slide", "slides", "dropping"]:
+        assert lexicon[word] == -1
+    for word in ["surge", "surging", "rally", "rallies"]:
+        assert lexicon[word] == 1
+
+
+def test_load_lexicon_uses_lm_year_columns(tmp_path, monkeypatch):
+    # LM category columns hold the year added; negative means later removed
+    csv_path = tmp_path / "lm.csv"
+    pd.DataFrame({
+        "Word": ["GAIN", "LOSS", "DROPPED_WORD", "NEUTRAL"],
+        "Positive": [2009, 0, 0, 0],
+        "Negative": [0, 2009, -2011, 0],
+    }).to_csv(csv_path, index=False)
+    monkeypatch.setenv("LM_DICTIONARY_PATH", str(csv_path))
+    assert headline_sentiment.load_lexicon().to_dict() == {"gain": 1, "loss": -1}
+
+
+def test_score_headlines(lexicon):
+    scores = headline_sentiment.score_headlines(
+        ["Stocks surge as Nasdaq rallies", "Oil falls on recession fears", "Stocks surge, oil slides",
+         "Fed holds rates", "", None],
+        lexicon,
+    )
+    assert scores["score"].tolist() == [1.0, -1.0, 0.0, 0.0, 0.0, 0.0]
+    assert scores["positive"].tolist() == [2, 0, 1, 0, 0, 0]
+    assert scores["negative"].tolist() == [0, 3, 1, 0, 0, 0]  # falls, recession, fears
+    assert scores["tokens"].tolist() == [5, 5, 4, 3, 0, 0]
+
+
+def test_score_articles_never_scores_a_url_twice(store, lexicon):
+    conn, history, _ = store
+    articles = [article("u1", "Stocks surge"), article("u2", "Oil slides"), article("u2", "Oil slides again")]
+    assert headline_sentiment.score_articles(conn, articles, lexicon, history=history) == 2
+    assert headline_sentiment.score_articles(conn, articles, lexicon, history=history) == 0
+    with open(history) as f:
+        assert len(f.readlines()) == 2
+
+
+def test_cache_rebuilds_from_history(store, lexicon, tmp_path):
+    conn, history, _ = store
+    headline_sentiment.score_articles(conn, [article("u1", "Stocks surge")], lexicon, history=history)
+    fresh = headline_sentiment.connect(str(tmp_path / "fresh.sqlite"), history)
+    assert len(headline_sentiment.load_history(fresh)) == 1
+    fresh.close()
+
+
+def test_truncated_history_line_does_not_break_later_runs(store, lexicon, tmp_path):
+    conn, history, cache = store
+    headline_sentiment.score_articles(conn, [article("u1", "Stocks surge")], lexicon, history=history)
+    # Simulate a crash part-way through writing a record
+    with open(history, "a") as f:
+        f.write('{"url_hash": "abc", "url": "u')
+    conn.close()
+
+    conn = headline_sentiment.connect(cache, history)
+    assert headline_sentiment.score_articles(conn, [article("u2", "Oil slides")], lexicon, history=history) == 1
+    conn.close()
+
+    with open(history) as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)["url"] for line in lines] == ["u1", "u2"]
+
+    fresh = headline_sentiment.connect(str(tmp_path / "fresh.sqlite"), history)
+    assert sorted(headline_sentiment.load_history(fresh)["url_hash"].unique()) == sorted(
+        headline_sentiment.url_hash(u) for u in ["u1", "u2"]
+    )
+    fresh.close()
+
+
+def test_sync_cache_skips_corrupt_lines(tmp_path, lexicon):
+    history = tmp_path / "history.jsonl"
+    conn = headline_sentiment.connect(str(tmp_path / "a.sqlite"), str(history))
+    headline_sentiment.score_articles(conn, [article("u1", "Stocks surge")], lexicon, history=str(history))
+    with open(history, "a") as f:
+        f.write('{"url_hash": "glued{"url_hash": "x"}\n')
+        f.write('{"url_hash": "missing fields"}\n')
+    headline_sentiment.score_articles(conn, [article("u2", "Oil slides")], lexicon, history=str(history))
+    conn.close()
+
+    fresh = headline_sentiment.connect(str(tmp_path / "b.sqlite"), str(history))
+    assert len(headline_sentiment.load_history(fresh)) == 2
+    fresh.close()
+
+
+def test_category_series_averages_only_headlines_with_hits(store, lexicon):
+    conn, history, _ = store
+    headline_sentiment.score_articles(conn, [
+        article("u1", "Stocks surge"),
+        article("u2", "Stock market holds steady"),
+        article("u3", "Oil slides"),
+    ], lexicon, history=history)
+    series = headline_sentiment.category_series(conn).set_index("category")
+    assert series.loc["Markets", "score"] == 1.0
+    assert series.loc["Markets", "headlines"] == 2
+    assert series.loc["Markets", "scored"] == 1
+    assert series.loc["Commodities", "score"] == -1.0
+
+
+def test_bundled_lexicon_loads_from_any_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("LM_DICTIONARY_PATH", raising=False)
+    assert len(headline_sentiment.load_lexicon()) > 0
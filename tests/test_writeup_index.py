@@ -0,0 +1,87 @@
+import pytest
+
+import writeup_index
+
+
+@pytest.fixture
+def index(tmp_path):
+    folder = tmp_path / "Daily_write_ups"
+    folder.mkdir()
+    (folder / "2025-12-10dailywriteup.txt").write_text(
+        "The 10Y-3M spread steepened while Brent crude fell on OPEC supply news."
+    )
+    (folder / "2025-12-11dailywriteup_rates.txt").write_text(
+        "Curve inversion deepened as the S&P 500 slipped; oil was near its lows."
+    )
+    conn = writeup_index.connect(str(tmp_path / "index.sqlite"))
+    writeup_index.sync(conn, str(folder))
+    yield conn, folder
+    conn.close()
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("2025-12-10dailywriteup.txt", ("2025-12-10", "pm")),
+    ("2025-12-10dailywriteup_am.txt", ("2025-12-10", "am")),
+    ("2025-12-10dailywriteup_megacap_tech.txt", ("2025-12-10", "megacap_tech")),
+    ("Daily_write_ups/2025-12-10dailywriteup_rates.txt", ("2025-12-10", "rates")),
+    ("notes.txt", None),
+    ("2025-12-10dailywriteup.md", None),
+    ("dailywriteup.txt", None),
+])
+def test_parse_filename(name, expected):
+    assert writeup_index.parse_filename(name) == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("inversion", '"inversion"'),
+    ("10Y-2Y", '"10Y-2Y"'),
+    ("S&P 500", '"S&P" "500"'),
+    ("oil NEAR gold", '"oil" "NEAR" "gold"'),
+    ("NEAR(brent opec, 10)", "NEAR(brent opec, 10)"),
+    ('"yield curve"', '"yield curve"'),
+    ("infla*", "infla*"),
+    ("oil OR gold", "oil OR gold"),
+])
+def test_fts_query(query, expected):
+    assert writeup_index._fts_query(query) == expected
+
+
+def test_search_literal_terms(index):
+    conn, _ = index
+    hits = writeup_index.search(conn, "10Y-3M")
+    assert [h["date"] for h in hits] == ["2025-12-10"]
+    assert writeup_index.HIGHLIGHT_START in hits[0]["snippet"]
+
+
+def test_search_edition_filter(index):
+    conn, _ = index
+    assert {h["edition"] for h in writeup_index.search(conn, "oil OR crude")} == {"pm", "rates"}
+    assert [h["edition"] for h in writeup_index.search(conn, "oil OR crude", edition="rates")] == ["rates"]
+
+
+def test_search_near_is_proximity_only_with_parentheses(index):
+    conn, _ = index
+    assert writeup_index.search(conn, "NEAR(brent opec, 5)")
+    # Bare "near" is a word: only the rates brief contains it
+    assert [h["edition"] for h in writeup_index.search(conn, "oil NEAR lows")] == ["rates"]
+
+
+def test_search_falls_back_to_literal_terms_on_bad_syntax(index):
+    conn, _ = index
+    hits = writeup_index.search(conn, "(brent")
+    assert [h["date"] for h in hits] == ["2025-12-10"]
+
+
+def test_search_empty_query(index):
+    conn, _ = index
+    assert writeup_index.search(conn, "   ") == []
+
+
+def test_sync_is_incremental(index, tmp_path):
+    conn, folder = index
+    assert writeup_index.sync(conn, str(folder)) == 0
+    (folder / "2025-12-12dailywriteup.txt").write_text("Gold rallied.")
+    assert writeup_index.sync(conn, str(folder)) == 1
+    (folder / "2025-12-12dailywriteup.txt").unlink()
+    writeup_index.sync(conn, str(folder))
+    assert writeup_index.search(conn, "gold") == []
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import glob
+import logging
+import os
+import re
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+# SQLite FTS5 full-text index over Daily_write_ups. It is a derived artifact:
+# delete it and the next sync() rebuilds it from the text files.
+WRITEUP_DIR = "Daily_write_ups"
+
+_FILENAME_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})dailywriteup(?:_(\w+))?\.txt$")
+
+# Private-use characters mark snippet highlights so callers can escape the
+# text before turning them into markup.
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_END = "\ue001"
+
+
+def index_path():
+    # Read on use so WRITEUP_INDEX_PATH can be set in .env
+    return os.getenv("WRITEUP_INDEX_PATH", "writeup_index.sqlite")
+
+
+def connect(path=None):
+    """Open (and create if needed) the writeup index."""
+    conn = sqlite3.connect(path or index_path())
+    conn.executescript("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS writeups USING fts5(
+            content,
+            path UNINDEXED,
+            date UNINDEXED,
+            edition UNINDEXED,
+            tokenize = 'porter unicode61'
+        );
+        CREATE TABLE IF NOT EXISTS indexed_files (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            doc_id INTEGER NOT NULL
+        );
+    """)
+    return conn
+
+
+def parse_filename(path):
+    """Return (date, edition) for a writeup file name, or None if it isn't one."""
+    match = _FILENAME_RE.match(os.path.basename(path))
+    if not match:
+        return None
+    return match.group(1), match.group(2) or "pm"
+
+
+def index_file(conn, path):
+    """Add or refresh one writeup in the index.
+
+    Files whose size and mtime match what was last indexed are skipped, so
+    this is cheap to call for every file. Returns True if the file was (re)indexed.
+    """
+    parsed = parse_filename(path)
+    if parsed is None:
+        return False
+    key = os.path.basename(path)
+    stat = os.stat(path)
+
+    row = conn.execute(
+        "SELECT mtime_ns, size, doc_id FROM indexed_files WHERE path = ?", (key,)
+    ).fetchone()
+    if row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+        return False
+
+    with open(path, "r") as f:
+        content = f.read()
+
+    date, edition = parsed
+    with conn:
+        if row:
+            conn.execute("DELETE FROM writeups WHERE rowid = ?", (row[2],))
+        cur = conn.execute(
+            "INSERT INTO writeups (content, path, date, edition) VALUES (?, ?, ?, ?)",
+            (content, key, date, edition),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO indexed_files (path, mtime_ns, size, doc_id) VALUES (?, ?, ?, ?)",
+            (key, stat.st_mtime_ns, stat.st_size, cur.lastrowid),
+        )
+    return True
+
+
+def sync(conn, folder=WRITEUP_DIR):
+    """Index any new or changed writeups in folder and drop ones that were deleted.
+
+    Returns the number of files (re)indexed.
+    """
+    paths = glob.glob(os.path.join(folder, "*dailywriteup*.txt"))
+    updated = sum(1 for path in paths if index_file(conn, path))
+
+    on_disk = {os.path.basename(path) for path in paths}
+    stale = [
+        (key, doc_id)
+        for key, doc_id in conn.execute("SELECT path, doc_id FROM indexed_files")
+        if key not in on_disk
+    ]
+    if stale:
+        with conn:
+            conn.executemany("DELETE FROM writeups WHERE rowid = ?", [(d,) for _, d in stale])
+            conn.executemany("DELETE FROM indexed_files WHERE path = ?", [(k,) for k, _ in stale])
+    if updated or stale:
+        logger.info(f"Writeup index: {updated} file(s) indexed, {len(stale)} removed")
+    return updated
+
+
+# NEAR is only an operator as NEAR(a b, n), which the "(" already covers;
+# a bare "near" is an ordinary word.
+_FTS_SYNTAX_RE = re.compile(r'"|\*|\(|\)|\b(?:AND|OR|NOT)\b')
+
+
+def _fts_query(query):
+    """Pass FTS5 syntax through untouched; otherwise search each term literally.
+
+    Quoting plain terms keeps input like "10Y-2Y" or "S&P" from being read
+    as FTS5 operators.
+    """
+    if _FTS_SYNTAX_RE.search(query):
+        return query
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def search(conn, query, limit=20, edition=None):
+    """Return ranked hits for query as dicts with path, date, edition, snippet and score.
+
+    FTS5 query syntax (OR, NEAR(a b, n), "phrases", prefix*) is honoured; if such a
+    query doesn't parse, its terms are searched literally instead.
+    """
+    query = query.strip()
+    if not query:
+        return []
+
+    sql = (
+        "SELECT path, date, edition, "
+        f"snippet(writeups, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', ' … ', 16), "
+        "bm25(writeups) "
+        "FROM writeups WHERE writeups MATCH ?"
+    )
+    params = [_fts_query(query)]
+    if edition:
+        sql += " AND edition = ?"
+        params.append(edition)
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    except sqlite3.OperationalError:
+        params[0] = " ".join('"' + t.replace('"', '""') + '"' for t in query.split())
+        rows = conn.execute(sql, params).fetchall()
+
+    return [
+        {"path": path, "date": date, "edition": edition, "snippet": snippet, "score": -score}
+        for path, date, edition, snippet, score in rows
+    ]